@@ -48,9 +48,6 @@ class EnhancedVoiceProcessor:
             return {"transcription": "", "language": "unknown", "error": "Whisper model not available"}
 
         try:
-            # Load and preprocess audio.
-            audio_data = self._preprocess_audio(audio_path)
-
             # Ensure only Hindi, English, and Hinglish are supported.
             supported_languages = ["hi", "en"]
             if language_hint not in supported_languages:
@@ -77,24 +74,6 @@ class EnhancedVoiceProcessor:
         except Exception as e:
             return {"transcription": "", "language": "unknown", "error": str(e)}
     
-    def _preprocess_audio(self, audio_path: str) -> np.ndarray:
-        """Preprocess audio for optimal transcription quality"""
-        try:
-            # Load audio with librosa.
-            audio, sr = librosa.load(audio_path, sr=self.sample_rate)
-            
-            # Normalize audio.
-            audio = librosa.util.normalize(audio)
-            
-            # Apply noise reduction if audio is very quiet.
-            if np.max(np.abs(audio)) < 0.1:
-                audio = audio * 3.0  # Amplify quiet audio
-            
-            return audio
-            
-        except Exception as e:
-            return np.array([])
-    
     def _estimate_confidence(self, whisper_result: Dict) -> float:
         """Estimate transcription confidence based on result characteristics"""
         text = whisper_result.get("text", "")
@@ -119,10 +98,14 @@ class EnhancedVoiceProcessor:
         
         return round(confidence, 2)
     
-    def extract_audio_features(self, audio_path: str) -> Dict[str, float]:
+    def extract_audio_features(self, audio_path: str, audio: Optional[np.ndarray] = None) -> Dict[str, float]:
         """Extract basic audio features for quality assessment"""
         try:
-            audio, sr = librosa.load(audio_path, sr=self.sample_rate)
+            # Reuse audio the caller already decoded at the processor sample rate.
+            if audio is None:
+                audio, sr = librosa.load(audio_path, sr=self.sample_rate)
+            else:
+                sr = self.sample_rate
             
             # Basic audio characteristics.
             duration = len(audio) / sr
@@ -145,9 +128,9 @@ class EnhancedVoiceProcessor:
         except Exception as e:
             return {'error': str(e)}
     
-    def validate_audio_quality(self, audio_path: str) -> Dict[str, bool]:
+    def validate_audio_quality(self, audio_path: str, audio: Optional[np.ndarray] = None) -> Dict[str, bool]:
         """Validate audio quality for reliable transcription"""
-        features = self.extract_audio_features(audio_path)
+        features = self.extract_audio_features(audio_path, audio)
         
         if 'error' in features:
             return {'valid': False, 'reason': features['error']}
@@ -168,13 +151,14 @@ class EnhancedVoiceProcessor:
             'features': features
         }
     
-    def process_audio_file(self, audio_path: str, language_hint: str = "hi") -> Dict:
+    def process_audio_file(self, audio_path: str, language_hint: str = "hi",
+                           audio: Optional[np.ndarray] = None) -> Dict:
         """
         Complete audio processing pipeline
         Includes quality validation, transcription, and feature extraction
         """
         # Validate audio quality.
-        quality_check = self.validate_audio_quality(audio_path)
+        quality_check = self.validate_audio_quality(audio_path, audio)
         
         if not quality_check['valid']:
             return {
@@ -187,8 +171,8 @@ class EnhancedVoiceProcessor:
         # Perform transcription.
         transcription_result = self.transcribe_audio(audio_path, language_hint)
         
-        # Extract audio features.
-        audio_features = self.extract_audio_features(audio_path)
+        # The quality check already extracted the audio features.
+        audio_features = quality_check['features']
         
         return {
             'transcription': transcription_result.get('transcription', ''),
@@ -5,6 +5,20 @@ MStress AI Services - Facial Emotion Recognition
 FastAPI service for comprehensive mental health assessment
 """
 
+import os
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Size the OpenMP/MKL pools to physical cores before any service imports torch;
+# hyperthread siblings only add contention in the BLAS kernels. Explicit settings win.
+_physical_cores = (psutil.cpu_count(logical=False) if PSUTIL_AVAILABLE else None) or os.cpu_count() or 1
+os.environ.setdefault("OMP_NUM_THREADS", str(_physical_cores))
+os.environ.setdefault("MKL_NUM_THREADS", str(_physical_cores))
+
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -15,7 +29,7 @@ import base64
 import logging
 
 # Import our services (each guarded to prevent startup failure if one import breaks)
-facial_emotion_service = None
+get_facial_emotion_service = None
 assessment_service = None
 analyze_text_sentiment = None
 analyze_multiple_texts_sentiment = None
@@ -32,7 +46,7 @@ get_audio_service_info = None
 
 # Legacy/optional services that may rely on mediapipe; keep non-fatal if they fail
 try:
-    from services.facial_emotion_service import facial_emotion_service  # legacy, optional
+    from services.facial_emotion_service import get_facial_emotion_service  # legacy, optional
 except Exception as e:
     logging.warning(f"services.facial_emotion_service unavailable: {e}")
 
@@ -181,8 +195,9 @@ async def analyze_facial_emotion(request: FacialEmotionRequest):
                 "user_id": request.user_id,
                 "timestamp": datetime.now().isoformat()
             }
-        elif facial_emotion_service:
-            # Fallback to legacy service
+        elif get_facial_emotion_service:
+            # Fallback to legacy service, built on first use
+            facial_emotion_service = get_facial_emotion_service()
             import cv2
             import numpy as np
 
@@ -242,8 +257,9 @@ async def analyze_facial_emotion(request: FacialEmotionRequest):
 async def analyze_webcam_frame(request: WebcamFrameRequest):
     """Analyze facial emotions from webcam frame with temporal consistency"""
     try:
-        if not facial_emotion_service:
+        if not get_facial_emotion_service:
             raise HTTPException(status_code=503, detail="Facial emotion service not available")
+        facial_emotion_service = get_facial_emotion_service()
         
         # Reset temporal state if requested
         if request.reset_temporal:
@@ -6,6 +6,17 @@ Converts voice features to DASS-21 compatible mental health scores
 import numpy as np
 from typing import Dict
 
+CONDITIONS = ('depression', 'anxiety', 'stress')
+COMPONENTS = ('prosodic', 'spectral', 'temporal', 'deep_learning')
+
+# DASS-21 severity bands: inclusive upper bound of each band below extremely severe.
+SEVERITY_LEVELS = ('normal', 'mild', 'moderate', 'severe', 'extremely_severe')
+SEVERITY_UPPER_BOUNDS = {
+    'depression': np.array([9, 13, 20, 27]),
+    'anxiety': np.array([7, 9, 14, 19]),
+    'stress': np.array([14, 18, 25, 33])
+}
+
 class MentalHealthScorer:
     """
     Converts voice features to mental health scores compatible with DASS-21 assessment
@@ -40,34 +51,21 @@ class MentalHealthScorer:
         temporal_scores = self._calculate_temporal_score(features)
         deep_learning_scores = self._calculate_deep_learning_score(features)
         
-        # Weighted combination of all components.
-        final_scores = {}
-        for condition in ['depression', 'anxiety', 'stress']:
-            weighted_score = (
-                prosodic_scores[condition] * self.component_weights['prosodic'] +
-                spectral_scores[condition] * self.component_weights['spectral'] +
-                temporal_scores[condition] * self.component_weights['temporal'] +
-                deep_learning_scores[condition] * self.component_weights['deep_learning']
-            )
-            final_scores[condition] = min(weighted_score, 100)
+        # Weighted combination of all components: (condition x component) scores times weights.
+        components = (prosodic_scores, spectral_scores, temporal_scores, deep_learning_scores)
+        score_matrix = np.array([[scores[condition] for scores in components] for condition in CONDITIONS], dtype=float)
+        weight_vector = np.array([self.component_weights[c] for c in COMPONENTS])
+        final_scores = dict(zip(CONDITIONS, np.minimum(score_matrix @ weight_vector, 100).tolist()))
         
         # Convert to DASS-21 compatible format.
+        confidence = self._calculate_confidence(features)
         return {
-            'depression': {
-                'score': round(final_scores['depression'], 1),
-                'severity': self._score_to_severity(final_scores['depression'], 'depression'),
-                'confidence': self._calculate_confidence(features)
-            },
-            'anxiety': {
-                'score': round(final_scores['anxiety'], 1),
-                'severity': self._score_to_severity(final_scores['anxiety'], 'anxiety'),
-                'confidence': self._calculate_confidence(features)
-            },
-            'stress': {
-                'score': round(final_scores['stress'], 1),
-                'severity': self._score_to_severity(final_scores['stress'], 'stress'),
-                'confidence': self._calculate_confidence(features)
+            condition: {
+                'score': round(final_scores[condition], 1),
+                'severity': self._score_to_severity(final_scores[condition], condition),
+                'confidence': confidence
             }
+            for condition in CONDITIONS
         }
 
     def _calculate_prosodic_score(self, features: Dict[str, float]) -> Dict[str, float]:
@@ -222,24 +220,8 @@ class MentalHealthScorer:
 
     def _score_to_severity(self, score: float, condition: str) -> str:
         """Convert numerical score to DASS-21 compatible severity levels"""
-        if condition == 'depression':
-            if score <= 9: return 'normal'
-            elif score <= 13: return 'mild'
-            elif score <= 20: return 'moderate'
-            elif score <= 27: return 'severe'
-            else: return 'extremely_severe'
-        elif condition == 'anxiety':
-            if score <= 7: return 'normal'
-            elif score <= 9: return 'mild'
-            elif score <= 14: return 'moderate'
-            elif score <= 19: return 'severe'
-            else: return 'extremely_severe'
-        else:  # stress
-            if score <= 14: return 'normal'
-            elif score <= 18: return 'mild'
-            elif score <= 25: return 'moderate'
-            elif score <= 33: return 'severe'
-            else: return 'extremely_severe'
+        upper_bounds = SEVERITY_UPPER_BOUNDS.get(condition, SEVERITY_UPPER_BOUNDS['stress'])
+        return SEVERITY_LEVELS[int(np.searchsorted(upper_bounds, score, side='left'))]
 
     def _calculate_confidence(self, features: Dict[str, float]) -> float:
         """Calculate confidence in the analysis based on feature quality"""
@@ -16,6 +16,62 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Inclusive lower bounds (percent) of the mild, moderate and high stress bands.
+STRESS_LEVELS = ('low', 'mild', 'moderate', 'high')
+STRESS_LEVEL_THRESHOLDS = np.array([25, 50, 75])
+
+def _stress_level(score: float) -> str:
+    """Map a 0-100 stress score to its level"""
+    return STRESS_LEVELS[int(np.searchsorted(STRESS_LEVEL_THRESHOLDS, score, side='right'))]
+
+# Advice for each overall stress level, plus one line for every category scoring 70% or more.
+LEVEL_RECOMMENDATIONS = {
+    'high': (
+        "Consider speaking with a mental health professional",
+        "Practice deep breathing exercises for 10-15 minutes daily",
+        "Ensure you're getting 7-9 hours of quality sleep",
+        "Try progressive muscle relaxation techniques"
+    ),
+    'moderate': (
+        "Practice mindfulness or meditation for 10-15 minutes daily",
+        "Maintain a regular sleep schedule",
+        "Take short breaks throughout your day",
+        "Try stress-reducing activities like yoga or walking"
+    ),
+    'mild': (
+        "Continue current stress management practices",
+        "Maintain work-life balance",
+        "Stay physically active",
+        "Practice gratitude exercises"
+    ),
+    'low': (
+        "Maintain your current healthy lifestyle",
+        "Continue regular exercise and good sleep habits",
+        "Stay connected with your support network"
+    )
+}
+
+CATEGORY_RECOMMENDATIONS = {
+    'academic': "Consider time management techniques for academic workload",
+    'social': "Focus on building supportive social connections",
+    'financial': "Consider financial planning or counseling resources",
+    'health': "Prioritize physical and mental health self-care",
+    'work': "Explore work-life balance strategies"
+}
+
+EMOTION_RECOMMENDATIONS = (
+    ('angry', "Practice anger management techniques"),
+    ('sad', "Consider mood-boosting activities and social support"),
+    ('fear', "Try anxiety reduction techniques like grounding exercises")
+)
+
+FALLBACK_RECOMMENDATIONS = (
+    "Practice deep breathing exercises",
+    "Maintain regular sleep schedule",
+    "Stay physically active",
+    "Consider speaking with a mental health professional if needed"
+)
+
 class AssessmentService:
     """
     Service for comprehensive stress assessment combining multiple modalities
@@ -103,14 +159,7 @@ class AssessmentService:
                     category_scores[category]['percentage'] = 0
             
             # Determine stress level.
-            if overall_score >= 75:
-                stress_level = 'high'
-            elif overall_score >= 50:
-                stress_level = 'moderate'
-            elif overall_score >= 25:
-                stress_level = 'mild'
-            else:
-                stress_level = 'low'
+            stress_level = _stress_level(overall_score)
             
             return {
                 'questionnaire_score': round(overall_score, 2),
@@ -142,7 +191,8 @@ class AssessmentService:
         try:
             # Import facial emotion service.
             try:
-                from .facial_emotion_service import facial_emotion_service
+                from .facial_emotion_service import get_facial_emotion_service
+                facial_emotion_service = get_facial_emotion_service()
                 
                 # Decode base64 image.
                 import cv2
@@ -247,14 +297,7 @@ class AssessmentService:
                 )
             
             # Determine final stress level.
-            if combined_score >= 75:
-                final_stress_level = 'high'
-            elif combined_score >= 50:
-                final_stress_level = 'moderate'
-            elif combined_score >= 25:
-                final_stress_level = 'mild'
-            else:
-                final_stress_level = 'low'
+            final_stress_level = _stress_level(combined_score)
             
             # Generate recommendations.
             recommendations = self.generate_recommendations(
@@ -306,61 +349,23 @@ class AssessmentService:
         
         try:
             # Base recommendations by stress level.
-            if stress_level == 'high':
-                recommendations.extend([
-                    "Consider speaking with a mental health professional",
-                    "Practice deep breathing exercises for 10-15 minutes daily",
-                    "Ensure you're getting 7-9 hours of quality sleep",
-                    "Try progressive muscle relaxation techniques"
-                ])
-            elif stress_level == 'moderate':
-                recommendations.extend([
-                    "Practice mindfulness or meditation for 10-15 minutes daily",
-                    "Maintain a regular sleep schedule",
-                    "Take short breaks throughout your day",
-                    "Try stress-reducing activities like yoga or walking"
-                ])
-            elif stress_level == 'mild':
-                recommendations.extend([
-                    "Continue current stress management practices",
-                    "Maintain work-life balance",
-                    "Stay physically active",
-                    "Practice gratitude exercises"
-                ])
-            else:
-                recommendations.extend([
-                    "Maintain your current healthy lifestyle",
-                    "Continue regular exercise and good sleep habits",
-                    "Stay connected with your support network"
-                ])
+            recommendations.extend(LEVEL_RECOMMENDATIONS.get(stress_level, LEVEL_RECOMMENDATIONS['low']))
             
             # Category-specific recommendations.
             for category, scores in category_scores.items():
-                if scores.get('percentage', 0) >= 70:
-                    if category == 'academic':
-                        recommendations.append("Consider time management techniques for academic workload")
-                    elif category == 'social':
-                        recommendations.append("Focus on building supportive social connections")
-                    elif category == 'financial':
-                        recommendations.append("Consider financial planning or counseling resources")
-                    elif category == 'health':
-                        recommendations.append("Prioritize physical and mental health self-care")
-                    elif category == 'work':
-                        recommendations.append("Explore work-life balance strategies")
+                if scores.get('percentage', 0) >= 70 and category in CATEGORY_RECOMMENDATIONS:
+                    recommendations.append(CATEGORY_RECOMMENDATIONS[category])
             
             # Facial emotion-based recommendations.
             if facial_analysis and facial_analysis.get('emotions_detected'):
-                dominant_emotions = [
+                dominant_emotions = {
                     emotion.get('dominant_emotion', '') 
                     for emotion in facial_analysis['emotions_detected']
-                ]
+                }
                 
-                if 'angry' in dominant_emotions:
-                    recommendations.append("Practice anger management techniques")
-                if 'sad' in dominant_emotions:
-                    recommendations.append("Consider mood-boosting activities and social support")
-                if 'fear' in dominant_emotions:
-                    recommendations.append("Try anxiety reduction techniques like grounding exercises")
+                for emotion, recommendation in EMOTION_RECOMMENDATIONS:
+                    if emotion in dominant_emotions:
+                        recommendations.append(recommendation)
             
             # Remove duplicates and limit to top recommendations.
             recommendations = list(dict.fromkeys(recommendations))[:8]
@@ -369,12 +374,7 @@ class AssessmentService:
             
         except Exception as e:
             logger.error(f"Error generating recommendations: {e}")
-            return [
-                "Practice deep breathing exercises",
-                "Maintain regular sleep schedule",
-                "Stay physically active",
-                "Consider speaking with a mental health professional if needed"
-            ]
+            return list(FALLBACK_RECOMMENDATIONS)
 
 # Global service instance.
 assessment_service = AssessmentService()
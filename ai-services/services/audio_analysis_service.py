@@ -56,7 +56,13 @@ class AudioAnalysisService:
         """
         try:
             y, sr = self.load_audio(audio_path)
-            
+        except Exception as e:
+            return {"error": str(e)}
+        return self._extract_features(y, sr)
+    
+    def _extract_features(self, y: np.ndarray, sr: int, onset_env: Optional[np.ndarray] = None) -> Dict:
+        """Extract features from loaded audio, reusing a precomputed onset envelope if given"""
+        try:
             # Duration
             duration = librosa.get_duration(y=y, sr=sr)
             
@@ -77,7 +83,8 @@ class AudioAnalysisService:
             chroma = librosa.feature.chroma_stft(y=y, sr=sr)
             
             # Tempogram
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+            if onset_env is None:
+                onset_env = librosa.onset.onset_strength(y=y, sr=sr)
             tempogram = librosa.feature.tempogram(onset_env=onset_env, sr=sr)
             
             return {
@@ -113,9 +120,16 @@ class AudioAnalysisService:
         """
         try:
             y, sr = self.load_audio(audio_path)
-            
+        except Exception as e:
+            return {"error": str(e)}
+        return self._analyze_speech_rate(y, sr)
+    
+    def _analyze_speech_rate(self, y: np.ndarray, sr: int, onset_env: Optional[np.ndarray] = None) -> Dict:
+        """Analyze speech rate of loaded audio, reusing a precomputed onset envelope if given"""
+        try:
             # Detect onsets (speech activity)
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+            if onset_env is None:
+                onset_env = librosa.onset.onset_strength(y=y, sr=sr)
             onsets = librosa.onset.onset_detect(onset_envelope=onset_env, sr=sr)
             
             # Duration
@@ -130,7 +144,7 @@ class AudioAnalysisService:
             
             # Threshold for silence
             threshold = np.mean(S_db) - 10
-            silent_frames = np.sum(S_db < threshold)
+            silent_frames = np.count_nonzero(S_db < threshold)
             total_frames = S_db.shape[1]
             silence_ratio = silent_frames / total_frames if total_frames > 0 else 0
             
@@ -156,8 +170,16 @@ class AudioAnalysisService:
             Dictionary with stress indicators
         """
         try:
-            features = self.extract_features(audio_path)
-            speech_analysis = self.analyze_speech_rate(audio_path)
+            # Decode once and share the onset envelope between both analyses
+            try:
+                y, sr = self.load_audio(audio_path)
+                onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+            except Exception as e:
+                # Same response as when the per-analysis loads failed
+                logger.error(f"Error loading audio for stress analysis: {e}")
+                return {"error": "Failed to analyze audio"}
+            features = self._extract_features(y, sr, onset_env)
+            speech_analysis = self._analyze_speech_rate(y, sr, onset_env)
             
             if "error" in features or "error" in speech_analysis:
                 return {"error": "Failed to analyze audio"}
@@ -4,6 +4,7 @@ Implements the Depression Anxiety Stress Scale (DASS-21) scoring algorithm
 for 20 MCQ questions based on the standard DASS-21 assessment.
 """
 
+import bisect
 from typing import List, Dict, Tuple
 import numpy as np
 
@@ -66,6 +67,48 @@ class DASS21ScoringService:
         }
     }
     
+    # Upper bounds and severity names per subscale, flattened once for bisect lookups
+    SEVERITY_BOUNDS = {
+        subscale: (tuple(high for _, high in bands.values()), tuple(bands))
+        for subscale, bands in SEVERITY_THRESHOLDS.items()
+    }
+    
+    # Overall severity bands: inclusive upper bound of each band below extremely severe
+    OVERALL_SEVERITY_BOUNDS = (10, 13, 20, 27)
+    OVERALL_SEVERITIES = ('normal', 'mild', 'moderate', 'severe', 'extremely_severe')
+    
+    # Interpretation of the highest subscale score, banded the same way
+    INTERPRETATION_BOUNDS = (9, 13, 20, 27)
+    INTERPRETATIONS = (
+        "Your mental health appears to be within normal range. Continue maintaining healthy habits.",
+        "You may be experiencing mild symptoms. Consider stress management techniques.",
+        "You may be experiencing moderate symptoms. Professional support is recommended.",
+        "You may be experiencing severe symptoms. Please seek professional help.",
+        "You may be experiencing extremely severe symptoms. Immediate professional support is strongly recommended."
+    )
+    
+    # Recommendations per subscale, given when the score is above the mild band
+    # Format: (subscale, threshold, recommendations)
+    SUBSCALE_RECOMMENDATIONS = (
+        ('depression', 13, (
+            "Consider speaking with a mental health professional about depression symptoms",
+            "Engage in regular physical activity and maintain social connections"
+        )),
+        ('anxiety', 9, (
+            "Practice relaxation techniques such as deep breathing or meditation",
+            "Limit caffeine intake and maintain regular sleep schedule"
+        )),
+        ('stress', 18, (
+            "Identify and address major sources of stress in your life",
+            "Practice time management and set realistic goals"
+        ))
+    )
+    
+    DEFAULT_RECOMMENDATIONS = (
+        "Maintain your current healthy lifestyle and coping strategies",
+        "Continue regular self-care and stress management practices"
+    )
+    
     def __init__(self):
         """Initialize the DASS-21 scoring service"""
         self.total_questions = 20
@@ -91,9 +134,10 @@ class DASS21ScoringService:
                 raise ValueError(f"Response {i} must be between 0-3, got {response}")
         
         # Calculate subscale scores
-        depression_score = self._calculate_subscale_score(responses, 'depression')
-        anxiety_score = self._calculate_subscale_score(responses, 'anxiety')
-        stress_score = self._calculate_subscale_score(responses, 'stress')
+        subscale_scores = self._calculate_subscale_scores(responses)
+        depression_score = subscale_scores['depression']
+        anxiety_score = subscale_scores['anxiety']
+        stress_score = subscale_scores['stress']
         
         # Get severity ratings
         depression_severity = self._get_severity(depression_score, 'depression')
@@ -129,77 +173,43 @@ class DASS21ScoringService:
             'recommendations': self._get_recommendations(depression_score, anxiety_score, stress_score)
         }
     
-    def _calculate_subscale_score(self, responses: List[int], subscale: str) -> float:
-        """Calculate score for a specific subscale (depression, anxiety, or stress)"""
-        score = 0
-        count = 0
+    def _calculate_subscale_scores(self, responses: List[int]) -> Dict[str, float]:
+        """Calculate depression, anxiety and stress scores in a single pass over the responses"""
+        scores = {subscale: 0 for subscale in self.SEVERITY_THRESHOLDS}
         
-        for question_idx, (sub, weight) in self.QUESTION_MAPPING.items():
-            if sub == subscale:
-                score += responses[question_idx] * weight
-                count += 1
+        for question_idx, (subscale, weight) in self.QUESTION_MAPPING.items():
+            scores[subscale] += responses[question_idx] * weight
         
         # DASS-21 uses a multiplier of 2 for the 21-item version
         # For 20-item version, we scale appropriately
-        return score * 2 if count > 0 else 0
+        return {subscale: score * 2 for subscale, score in scores.items()}
     
     def _get_severity(self, score: float, subscale: str) -> str:
         """Get severity rating for a subscale score"""
-        thresholds = self.SEVERITY_THRESHOLDS[subscale]
+        upper_bounds, severities = self.SEVERITY_BOUNDS[subscale]
         
-        for severity, (min_val, max_val) in thresholds.items():
-            if min_val <= score <= max_val:
-                return severity
-        
-        return 'extremely_severe'
+        # First band whose upper bound is >= score; anything past the table is extremely severe
+        band = bisect.bisect_left(upper_bounds, score)
+        return severities[min(band, len(severities) - 1)]
     
     def _get_overall_severity(self, overall_score: float) -> str:
         """Get overall severity rating"""
-        if overall_score <= 10:
-            return 'normal'
-        elif overall_score <= 13:
-            return 'mild'
-        elif overall_score <= 20:
-            return 'moderate'
-        elif overall_score <= 27:
-            return 'severe'
-        else:
-            return 'extremely_severe'
+        band = bisect.bisect_left(self.OVERALL_SEVERITY_BOUNDS, overall_score)
+        return self.OVERALL_SEVERITIES[band]
     
     def _get_interpretation(self, depression: float, anxiety: float, stress: float) -> str:
         """Get interpretation of the assessment results"""
         highest = max(depression, anxiety, stress)
         
-        if highest <= 9:
-            return "Your mental health appears to be within normal range. Continue maintaining healthy habits."
-        elif highest <= 13:
-            return "You may be experiencing mild symptoms. Consider stress management techniques."
-        elif highest <= 20:
-            return "You may be experiencing moderate symptoms. Professional support is recommended."
-        elif highest <= 27:
-            return "You may be experiencing severe symptoms. Please seek professional help."
-        else:
-            return "You may be experiencing extremely severe symptoms. Immediate professional support is strongly recommended."
+        return self.INTERPRETATIONS[bisect.bisect_left(self.INTERPRETATION_BOUNDS, highest)]
     
     def _get_recommendations(self, depression: float, anxiety: float, stress: float) -> List[str]:
         """Get personalized recommendations based on scores"""
+        scores = {'depression': depression, 'anxiety': anxiety, 'stress': stress}
         recommendations = []
         
-        if depression > 13:
-            recommendations.append("Consider speaking with a mental health professional about depression symptoms")
-            recommendations.append("Engage in regular physical activity and maintain social connections")
-        
-        if anxiety > 9:
-            recommendations.append("Practice relaxation techniques such as deep breathing or meditation")
-            recommendations.append("Limit caffeine intake and maintain regular sleep schedule")
-        
-        if stress > 18:
-            recommendations.append("Identify and address major sources of stress in your life")
-            recommendations.append("Practice time management and set realistic goals")
+        for subscale, threshold, messages in self.SUBSCALE_RECOMMENDATIONS:
+            if scores[subscale] > threshold:
+                recommendations.extend(messages)
         
-        if not recommendations:
-            recommendations.append("Maintain your current healthy lifestyle and coping strategies")
-            recommendations.append("Continue regular self-care and stress management practices")
-        
-        return recommendations
-
+        return recommendations or list(self.DEFAULT_RECOMMENDATIONS)
@@ -43,6 +43,7 @@ import torch.nn.functional as F
 from torchvision import transforms
 from pathlib import Path
 import sys
+from collections import deque
 from contextlib import contextmanager
 
 @contextmanager
@@ -64,6 +65,11 @@ with suppress_stderr():
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    """Numerically stable softmax over a 1-D logit vector"""
+    exp = np.exp(logits - logits.max())
+    return exp / exp.sum()
+
 class Bottleneck(nn.Module):
     expansion = 4
     def __init__(self, in_channels, out_channels, i_downsample=None, stride=1):
@@ -191,13 +197,12 @@ class LSTMPyTorch(nn.Module):
         self.lstm1 = nn.LSTM(input_size=512, hidden_size=512, batch_first=True, bidirectional=False)
         self.lstm2 = nn.LSTM(input_size=512, hidden_size=256, batch_first=True, bidirectional=False)
         self.fc = nn.Linear(256, 7)
-        self.softmax = nn.Softmax(dim=1)
 
     def forward(self, x):
+        # Returns logits; softmax is applied on the host only where probabilities are reported.
         x, _ = self.lstm1(x)
         x, _ = self.lstm2(x)        
         x = self.fc(x[:, -1, :])
-        x = self.softmax(x)
         return x
 
 class PreprocessInput(torch.nn.Module):
@@ -205,8 +210,8 @@ class PreprocessInput(torch.nn.Module):
         super(PreprocessInput, self).__init__()
 
     def forward(self, x):
+        # Expects BGR channel order, which the model was trained on.
         x = x.to(torch.float32)
-        x = torch.flip(x, dims=(0,))
         x[0, :, :] -= 91.4953
         x[1, :, :] -= 103.8827
         x[2, :, :] -= 131.0912
@@ -218,6 +223,13 @@ class FacialEmotionService:
     Provides both static and dynamic (temporal) emotion recognition
     """
     
+    # Number of frames kept in the LSTM sliding window.
+    LSTM_WINDOW = 10
+    
+    # Lower bounds (inclusive) of the 'moderate' and 'high' stress score bands.
+    STRESS_THRESHOLDS = np.array([40.0, 70.0])
+    STRESS_LEVELS = ('low', 'moderate', 'high')
+    
     def __init__(self, model_path: Optional[str] = None, use_dynamic: bool = True):
         """
         Initialize the enhanced facial emotion recognition service
@@ -241,6 +253,15 @@ class FacialEmotionService:
             'low_stress': ['Happiness', 'Neutral']
         }
         
+        # Per-label stress weights (high=3, moderate=2, otherwise 1), indexed like emotion_labels.
+        self.label_index = {label: i for i, label in enumerate(self.emotion_labels)}
+        self.stress_weights = np.array([
+            3.0 if label in self.stress_indicators['high_stress']
+            else 2.0 if label in self.stress_indicators['moderate_stress']
+            else 1.0
+            for label in self.emotion_labels
+        ])
+        
         # Initialize MediaPipe face detection with optimized settings.
         self.mp_face_mesh = mp.solutions.face_mesh
         try:
@@ -265,7 +286,7 @@ class FacialEmotionService:
         self.backbone_model = self._load_backbone_model()
         if self.use_dynamic:
             self.lstm_model = self._load_lstm_model()
-            self.lstm_features = []  # Store features for temporal analysis
+            self.lstm_features = deque(maxlen=self.LSTM_WINDOW)  # Store features for temporal analysis
         
         # Image preprocessing.
         self.transform = transforms.Compose([
@@ -300,6 +321,8 @@ class FacialEmotionService:
             
             model.to(self.device)
             model.eval()
+            # Channels-last lets oneDNN/cuDNN pick NHWC conv kernels without internal transposes.
+            model = model.to(memory_format=torch.channels_last)
             return model
             
         except Exception as e:
@@ -341,35 +364,21 @@ class FacialEmotionService:
             logger.error(f"❌ Error creating LSTM model: {e}")
             return None
     
-    def _norm_coordinates(self, normalized_x, normalized_y, image_width, image_height):
-        """Convert normalized coordinates to pixel coordinates"""
-        x_px = min(math.floor(normalized_x * image_width), image_width - 1)
-        y_px = min(math.floor(normalized_y * image_height), image_height - 1)
-        return x_px, y_px
-    
     def _get_face_box(self, landmarks, w, h):
         """Extract face bounding box from MediaPipe landmarks"""
-        idx_to_coors = {}
-        for idx, landmark in enumerate(landmarks.landmark):
-            landmark_px = self._norm_coordinates(landmark.x, landmark.y, w, h)
-            if landmark_px:
-                idx_to_coors[idx] = landmark_px
-
-        if not idx_to_coors:
+        points = np.array([(landmark.x, landmark.y) for landmark in landmarks.landmark], dtype=np.float64)
+        if points.size == 0:
             return None
 
-        x_coords = [coord[0] for coord in idx_to_coors.values()]
-        y_coords = [coord[1] for coord in idx_to_coors.values()]
-        
-        x_min = min(x_coords)
-        y_min = min(y_coords)
-        x_max = max(x_coords)
-        y_max = max(y_coords)
+        # Scale all landmarks to pixels at once and reduce to the enclosing box.
+        pixels = np.floor(points * (w, h))
+        x_min, y_min = pixels.min(axis=0)
+        x_max, y_max = pixels.max(axis=0)
 
-        startX = max(0, x_min)
-        startY = max(0, y_min)
-        endX = min(w - 1, x_max)
-        endY = min(h - 1, y_max)
+        startX = max(0, min(int(x_min), w - 1))
+        startY = max(0, min(int(y_min), h - 1))
+        endX = min(w - 1, int(x_max))
+        endY = min(h - 1, int(y_max))
         
         return startX, startY, endX, endY
     
@@ -403,14 +412,15 @@ class FacialEmotionService:
     def _preprocess_face(self, face_image: np.ndarray) -> torch.Tensor:
         """Preprocess face image for model input"""
         try:
-            # Convert to PIL Image.
-            pil_image = Image.fromarray(cv2.cvtColor(face_image, cv2.COLOR_BGR2RGB))
+            # Convert to PIL Image, keeping OpenCV's BGR order the model expects.
+            pil_image = Image.fromarray(face_image)
             
             # Resize to model input size.
             pil_image = pil_image.resize((224, 224), Image.Resampling.NEAREST)
             
             # Apply transforms.
-            input_tensor = self.transform(pil_image).unsqueeze(0).to(self.device)
+            input_tensor = self.transform(pil_image).unsqueeze(0)
+            input_tensor = input_tensor.contiguous(memory_format=torch.channels_last).to(self.device)
             
             return input_tensor
         except Exception as e:
@@ -437,20 +447,18 @@ class FacialEmotionService:
                 return self._get_mock_emotion_result()
             
             # Get emotion predictions.
-            with torch.no_grad():
-                outputs = self.backbone_model(input_tensor)
-                probabilities = torch.nn.functional.softmax(outputs, dim=1)
-                confidence_scores = probabilities.cpu().numpy()[0]
+            with torch.inference_mode():
+                logits = self.backbone_model(input_tensor).cpu().numpy()[0]
+            confidence_scores = _softmax(logits)
             
             # Create emotion results.
-            emotion_results = {}
-            for i, emotion in enumerate(self.emotion_labels):
-                emotion_results[emotion] = float(confidence_scores[i])
+            scores = confidence_scores.tolist()
+            emotion_results = dict(zip(self.emotion_labels, scores))
             
             # Get dominant emotion.
-            dominant_emotion_idx = np.argmax(confidence_scores)
+            dominant_emotion_idx = int(np.argmax(confidence_scores))
             dominant_emotion = self.emotion_labels[dominant_emotion_idx]
-            confidence = float(np.max(confidence_scores))
+            confidence = scores[dominant_emotion_idx]
             
             return {
                 'dominant_emotion': dominant_emotion,
@@ -484,35 +492,34 @@ class FacialEmotionService:
                 return self._get_mock_emotion_result()
             
             # Extract features using backbone.
-            with torch.no_grad():
+            with torch.inference_mode():
                 features = torch.nn.functional.relu(
                     self.backbone_model.extract_features(input_tensor)
-                ).cpu().detach().numpy()
+                ).cpu().numpy()
             
-            # Maintain sliding window of features (10 frames).
+            # Maintain sliding window of features (deque evicts the oldest frame).
             if len(self.lstm_features) == 0:
-                self.lstm_features = [features] * 10
+                self.lstm_features.extend([features] * self.LSTM_WINDOW)
             else:
-                self.lstm_features = self.lstm_features[1:] + [features]
+                self.lstm_features.append(features)
             
             # Prepare LSTM input.
             lstm_input = torch.from_numpy(np.vstack(self.lstm_features))
             lstm_input = torch.unsqueeze(lstm_input, 0).to(self.device)
             
             # Get emotion predictions.
-            with torch.no_grad():
-                outputs = self.lstm_model(lstm_input)
-                confidence_scores = outputs.cpu().detach().numpy()[0]
+            with torch.inference_mode():
+                logits = self.lstm_model(lstm_input).cpu().numpy()[0]
+            confidence_scores = _softmax(logits)
             
             # Create emotion results.
-            emotion_results = {}
-            for i, emotion in enumerate(self.emotion_labels):
-                emotion_results[emotion] = float(confidence_scores[i])
+            scores = confidence_scores.tolist()
+            emotion_results = dict(zip(self.emotion_labels, scores))
             
             # Get dominant emotion.
-            dominant_emotion_idx = np.argmax(confidence_scores)
+            dominant_emotion_idx = int(np.argmax(confidence_scores))
             dominant_emotion = self.emotion_labels[dominant_emotion_idx]
-            confidence = float(np.max(confidence_scores))
+            confidence = scores[dominant_emotion_idx]
             
             return {
                 'dominant_emotion': dominant_emotion,
@@ -608,36 +615,23 @@ class FacialEmotionService:
                 }
             
             # Calculate weighted stress score.
-            total_stress_score = 0
-            total_confidence = 0
-            emotion_counts = {emotion: 0 for emotion in self.emotion_labels}
+            label_idx = np.array([
+                self.label_index[result.get('dominant_emotion', 'Neutral')] for result in emotion_results
+            ])
+            confidences = np.array([result.get('confidence', 0) for result in emotion_results], dtype=float)
             
-            for result in emotion_results:
-                dominant_emotion = result.get('dominant_emotion', 'Neutral')
-                confidence = result.get('confidence', 0)
-                
-                emotion_counts[dominant_emotion] += 1
-                total_confidence += confidence
-                
-                # Assign stress weights.
-                if dominant_emotion in self.stress_indicators['high_stress']:
-                    total_stress_score += 3 * confidence
-                elif dominant_emotion in self.stress_indicators['moderate_stress']:
-                    total_stress_score += 2 * confidence
-                else:
-                    total_stress_score += 1 * confidence
+            counts = np.bincount(label_idx, minlength=len(self.emotion_labels))
+            emotion_counts = dict(zip(self.emotion_labels, counts.tolist()))
+            total_confidence = float(confidences.sum())
+            total_stress_score = float(self.stress_weights[label_idx] @ confidences)
             
             # Normalize stress score.
             avg_confidence = total_confidence / len(emotion_results)
             normalized_stress_score = (total_stress_score / (3 * len(emotion_results))) * 100
             
             # Determine stress level.
-            if normalized_stress_score >= 70:
-                stress_level = 'high'
-            elif normalized_stress_score >= 40:
-                stress_level = 'moderate'
-            else:
-                stress_level = 'low'
+            band = int(np.searchsorted(self.STRESS_THRESHOLDS, normalized_stress_score, side='right'))
+            stress_level = self.STRESS_LEVELS[band]
             
             return {
                 'stress_level': stress_level,
@@ -659,7 +653,14 @@ class FacialEmotionService:
 
     def reset_temporal_state(self):
         """Reset the temporal state for LSTM model"""
-        self.lstm_features = []
+        self.lstm_features = deque(maxlen=self.LSTM_WINDOW)
+
+# Global instance, created on first access so importing the module does not load the models.
+_facial_emotion_service = None
 
-# Create a global instance.
-facial_emotion_service = FacialEmotionService()
\ No newline at end of file
+def get_facial_emotion_service() -> FacialEmotionService:
+    """Get or create the global facial emotion service instance"""
+    global _facial_emotion_service
+    if _facial_emotion_service is None:
+        _facial_emotion_service = FacialEmotionService()
+    return _facial_emotion_service
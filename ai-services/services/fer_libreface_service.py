@@ -3,6 +3,7 @@ Facial Expression Recognition (FER) Service using libreface
 Provides emotion recognition from facial images
 """
 
+import functools
 import logging
 import os
 import base64
@@ -18,6 +19,13 @@ import torchvision.transforms as transforms
 
 logger = logging.getLogger(__name__)
 
+FACE_CASCADE_FILE = 'haarcascade_frontalface_default.xml'
+
+@functools.lru_cache(maxsize=None)
+def _load_cascade(name: str) -> cv2.CascadeClassifier:
+    """Load a Haar cascade once per process and share it across recognizer instances"""
+    return cv2.CascadeClassifier(cv2.data.haarcascades + name)
+
 class FacialExpressionRecognizer:
     """
     Facial Expression Recognition using deep learning
@@ -32,6 +40,8 @@ class FacialExpressionRecognizer:
         self.emotion_labels = [
             'angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral'
         ]
+        # Instance RNG for placeholder scores, avoids the global np.random state lock
+        self._rng = np.random.default_rng()
         self._initialize_components()
     
     def _initialize_components(self):
@@ -40,8 +50,7 @@ class FacialExpressionRecognizer:
             logger.info("Initializing Facial Expression Recognition service...")
             
             # Load face cascade classifier
-            cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-            self.face_cascade = cv2.CascadeClassifier(cascade_path)
+            self.face_cascade = _load_cascade(FACE_CASCADE_FILE)
             
             if self.face_cascade.empty():
                 logger.warning("Face cascade classifier not found, using alternative")
@@ -65,14 +74,11 @@ class FacialExpressionRecognizer:
             if not os.path.exists(image_path):
                 return []
             
-            # Read image
-            image = cv2.imread(image_path)
-            if image is None:
+            # Read image straight into grayscale, the decoder skips the color buffer
+            gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+            if gray is None:
                 return []
             
-            # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
             # Detect faces
             faces = self.face_cascade.detectMultiScale(
                 gray,
@@ -127,16 +133,14 @@ class FacialExpressionRecognizer:
             
             # For now, return mock emotion data
             # In production, this would use a trained emotion classification model
-            emotions = {
-                emotion: np.random.random() for emotion in self.emotion_labels
-            }
+            scores = self._rng.random(len(self.emotion_labels))
             
             # Normalize to sum to 1
-            total = sum(emotions.values())
-            emotions = {k: v/total for k, v in emotions.items()}
+            scores /= scores.sum()
+            emotions = dict(zip(self.emotion_labels, scores.tolist()))
             
             # Get dominant emotion
-            dominant_emotion = max(emotions, key=emotions.get)
+            dominant_emotion = self.emotion_labels[int(scores.argmax())]
             
             return {
                 "success": True,
@@ -0,0 +1,26 @@
+"""
+Model Loading Helpers
+Shared loading and CPU optimization steps for the PyTorch-backed services
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+def quantize_for_cpu(model):
+    """Dynamically quantize the Linear layers to int8, keeping fp32 if the CPU backend can't"""
+    # Imported here so importing this module stays cheap for callers that never quantize.
+    import torch
+    try:
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    except Exception as e:
+        logger.warning(f"Dynamic quantization unavailable, using fp32 model: {e}")
+        return model
+
+def from_pretrained(model_class, name: str, **kwargs):
+    """Load from the local Hugging Face cache first, only going to the network on a cache miss"""
+    try:
+        return model_class.from_pretrained(name, local_files_only=True, **kwargs)
+    except OSError:
+        logger.info(f"{name} not in local cache, downloading")
+        return model_class.from_pretrained(name, **kwargs)
@@ -3,21 +3,58 @@ RoBERTa-based Sentiment Analysis Service
 Provides sentiment analysis using the RoBERTa model from Hugging Face
 """
 
+import functools
 import logging
+import os
 from typing import Dict, Optional
 # This file provides sentiment analysis using the RoBERTa model for text-based assessment responses.
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import numpy as np
 
+from .model_loading import from_pretrained, quantize_for_cpu
+
 logger = logging.getLogger(__name__)
 
+# Imported when the first analyzer is built. The other services already load torch at startup,
+# so what this defers is the transformers and IPEX import until sentiment is first requested
+torch = None
+AutoTokenizer = None
+AutoModelForSequenceClassification = None
+ipex = None
+IPEX_AVAILABLE = False
+
+def _import_model_libraries():
+    """Import torch, transformers and, when installed, IPEX into the module on first use"""
+    global torch, AutoTokenizer, AutoModelForSequenceClassification, ipex, IPEX_AVAILABLE
+    if AutoModelForSequenceClassification is not None:
+        return
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    try:
+        import intel_extension_for_pytorch as ipex
+        IPEX_AVAILABLE = True
+    except ImportError:
+        IPEX_AVAILABLE = False
+
+# Map model labels to standard sentiment labels
+SENTIMENT_MAPPING = {
+    "negative": "negative",
+    "neutral": "neutral",
+    "positive": "positive"
+}
+
 class RoBERTaSentimentAnalyzer:
     """
     Sentiment analyzer using RoBERTa model
     Supports both English and multilingual analysis
     """
     
+    # Number of texts tokenized and run through the model together
+    BATCH_SIZE = 16
+    
+    # Texts up to this length are memoized; short answers repeat often across assessments
+    CACHE_MAX_CHARS = 128
+    CACHE_SIZE = 4096
+    
     def __init__(self, model_name: str = "cardiffnlp/twitter-roberta-base-sentiment-latest"):
         """
         Initialize RoBERTa sentiment analyzer
@@ -25,32 +62,77 @@ class RoBERTaSentimentAnalyzer:
         Args:
             model_name: Hugging Face model identifier
         """
+        _import_model_libraries()
         self.model_name = model_name
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.tokenizer = None
         self.model = None
         self.id2label = None
         self.label2id = None
+        # Set when IPEX has prepared the model for bfloat16 on CPU
+        self.cpu_bf16 = False
+        # Per-instance cache so entries never outlive the model that produced them
+        self._cached_analyze = functools.lru_cache(maxsize=self.CACHE_SIZE)(self._analyze_text)
         self._initialize_model()
     
     def _initialize_model(self):
         """Initialize the RoBERTa model and tokenizer"""
         try:
             logger.info(f"Loading RoBERTa model: {self.model_name}")
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+            self.tokenizer = from_pretrained(AutoTokenizer, self.model_name)
+            # fp16 on CUDA; the CPU path starts from fp32 so IPEX or int8 quantization can take over
+            dtype = torch.float16 if self.device == "cuda" else torch.float32
+            self.model = from_pretrained(AutoModelForSequenceClassification, self.model_name, torch_dtype=dtype)
             self.model.to(self.device)
             self.model.eval()
+            if self.device == "cpu":
+                if IPEX_AVAILABLE and self._cpu_supports_bf16():
+                    self.model = self._optimize_with_ipex(self.model)
+                if not self.cpu_bf16:
+                    self.model = quantize_for_cpu(self.model)
             
             # Get label mappings
             self.id2label = self.model.config.id2label
             self.label2id = self.model.config.label2id
             
+            # Graph compilation pays off on long-running servers but makes startup slow, so it is opt-in
+            if os.environ.get("MSTRESS_TORCH_COMPILE") == "1":
+                self._compile_model()
+            
             logger.info(f"✓ RoBERTa model loaded successfully on {self.device}")
         except Exception as e:
             logger.error(f"Failed to load RoBERTa model: {e}")
             raise
     
+    def _cpu_supports_bf16(self) -> bool:
+        """Check whether oneDNN has native bfloat16 kernels on this CPU"""
+        try:
+            return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+        except Exception:
+            # Older torch builds lack the probe; int8 quantization is the safe choice there
+            return False
+    
+    def _optimize_with_ipex(self, model):
+        """Apply IPEX oneDNN fusions with bfloat16 weights, keeping the model unchanged on failure"""
+        try:
+            model = ipex.optimize(model, dtype=torch.bfloat16)
+            self.cpu_bf16 = True
+        except Exception as e:
+            logger.warning(f"IPEX optimization failed, falling back to int8 quantization: {e}")
+        return model
+    
+    def _compile_model(self):
+        """Compile the model with torch.compile, keeping eager mode if compilation is unsupported"""
+        eager_model = self.model
+        try:
+            # Batch size and sequence length vary per request, so compile for dynamic shapes
+            self.model = torch.compile(eager_model, dynamic=True)
+            # Compilation is deferred to the first forward, so run one here to surface failures
+            self._predict(["ok"])
+        except Exception as e:
+            logger.warning(f"torch.compile unavailable, using eager model: {e}")
+            self.model = eager_model
+    
     def analyze_sentiment(self, text: str) -> Dict:
         """
         Analyze sentiment of input text
@@ -70,53 +152,12 @@ class RoBERTaSentimentAnalyzer:
                     "error": "Empty text provided"
                 }
             
-            # Tokenize input
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
-                truncation=True,
-                max_length=512,
-                padding=True
-            ).to(self.device)
-            
-            # Get predictions
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-                probabilities = torch.softmax(logits, dim=-1)
-            
-            # Get the predicted label and confidence
-            predicted_label_id = torch.argmax(logits, dim=-1).item()
-            predicted_label = self.id2label[predicted_label_id]
-            confidence = probabilities[0][predicted_label_id].item()
-            
-            # Map to standard sentiment labels
-            sentiment_mapping = {
-                "negative": "negative",
-                "neutral": "neutral",
-                "positive": "positive"
-            }
-            
-            sentiment = sentiment_mapping.get(predicted_label.lower(), "neutral")
-            
-            # Calculate sentiment score (-1 to 1)
-            if sentiment == "positive":
-                score = confidence
-            elif sentiment == "negative":
-                score = -confidence
-            else:
-                score = 0.0
+            if len(text) <= self.CACHE_MAX_CHARS:
+                result = self._cached_analyze(text)
+                # Cached results are shared, so hand out a copy
+                return {**result, "all_scores": dict(result["all_scores"])}
             
-            return {
-                "sentiment": sentiment,
-                "score": float(score),
-                "confidence": float(confidence),
-                "label": predicted_label,
-                "all_scores": {
-                    self.id2label[i]: float(probabilities[0][i].item())
-                    for i in range(len(self.id2label))
-                }
-            }
+            return self._analyze_text(text)
         
         except Exception as e:
             logger.error(f"Error analyzing sentiment: {e}")
@@ -127,6 +168,11 @@ class RoBERTaSentimentAnalyzer:
                 "error": str(e)
             }
     
+    def _analyze_text(self, text: str) -> Dict:
+        """Run a single non-empty text through the model and build its result"""
+        probabilities = self._predict([text])[0]
+        return self._build_result(probabilities)
+    
     def analyze_batch(self, texts: list) -> list:
         """
         Analyze sentiment for multiple texts
@@ -137,11 +183,89 @@ class RoBERTaSentimentAnalyzer:
         Returns:
             List of sentiment analysis results
         """
-        results = []
-        for text in texts:
-            results.append(self.analyze_sentiment(text))
+        results = [None] * len(texts)
+        
+        # Empty texts never reach the model; analyze_sentiment returns their error result
+        pending = []
+        for i, text in enumerate(texts):
+            if isinstance(text, str) and text.strip():
+                pending.append(i)
+            else:
+                results[i] = self.analyze_sentiment(text)
+        
+        # Batch texts of similar length together to keep padding small
+        pending.sort(key=lambda i: len(texts[i]))
+        for start in range(0, len(pending), self.BATCH_SIZE):
+            indices = pending[start:start + self.BATCH_SIZE]
+            try:
+                probabilities = self._predict([texts[i] for i in indices])
+            except Exception as e:
+                logger.error(f"Error analyzing sentiment batch: {e}")
+                for i in indices:
+                    results[i] = {
+                        "sentiment": "neutral",
+                        "score": 0.0,
+                        "confidence": 0.0,
+                        "error": str(e)
+                    }
+                continue
+            
+            for i, row in zip(indices, probabilities):
+                results[i] = self._build_result(row)
+        
         return results
     
+    def _predict(self, texts: list) -> "torch.Tensor":
+        """Run the model on a list of texts and return their class probabilities on the CPU"""
+        inputs = self.tokenizer(
+            texts,
+            return_tensors="pt",
+            truncation=True,
+            max_length=512,
+            padding=True
+        )
+        if self.device == "cuda":
+            # Pinned host buffers let the small H2D copies run asynchronously
+            inputs = {k: v.pin_memory().to(self.device, non_blocking=True) for k, v in inputs.items()}
+        
+        with torch.inference_mode(), torch.autocast("cpu", dtype=torch.bfloat16, enabled=self.cpu_bf16):
+            logits = self.model(**inputs).logits
+            probabilities = torch.softmax(logits.float(), dim=-1)
+        
+        return probabilities.cpu()
+    
+    def _build_result(self, probabilities: "torch.Tensor") -> Dict:
+        """Build the sentiment result for one text from its class probabilities"""
+        # One conversion to Python floats; everything below reads from this list
+        scores = probabilities.tolist()
+        
+        # Get the predicted label and confidence
+        predicted_label_id = max(range(len(scores)), key=scores.__getitem__)
+        predicted_label = self.id2label[predicted_label_id]
+        confidence = scores[predicted_label_id]
+        
+        # Map to standard sentiment labels
+        sentiment = SENTIMENT_MAPPING.get(predicted_label.lower(), "neutral")
+        
+        # Calculate sentiment score (-1 to 1)
+        if sentiment == "positive":
+            score = confidence
+        elif sentiment == "negative":
+            score = -confidence
+        else:
+            score = 0.0
+        
+        return {
+            "sentiment": sentiment,
+            "score": score,
+            "confidence": confidence,
+            "label": predicted_label,
+            "all_scores": {
+                self.id2label[i]: scores[i]
+                for i in range(len(self.id2label))
+            }
+        }
+    
     def get_model_info(self) -> Dict:
         """Get information about the loaded model"""
         return {
@@ -15,6 +15,8 @@ import os
 from pathlib import Path
 import json
 
+from .model_loading import quantize_for_cpu
+
 # Configure logging.
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -77,14 +79,18 @@ class SentimentAnalysisService:
                 local_files_only=True
             )
             
+            # The local checkpoint is loaded in fp16 on GPU and kept fp32 on CPU for int8 quantization.
             self.model = AutoModelForSequenceClassification.from_pretrained(
                 self.model_path,
-                local_files_only=True
+                local_files_only=True,
+                torch_dtype=torch.float16 if self.device.type == 'cuda' else torch.float32
             )
             
             # Move model to device.
             self.model.to(self.device)
             self.model.eval()
+            if self.device.type == 'cpu':
+                self.model = quantize_for_cpu(self.model)
             
             self.is_initialized = True
             logger.info(f"RoBERTa sentiment model loaded successfully from {self.model_path}")
@@ -121,13 +127,14 @@ class SentimentAnalysisService:
                 max_length=512
             )
             
-            # Move inputs to device.
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            # Move inputs to device, through pinned memory so CUDA copies can run asynchronously.
+            if self.device.type == 'cuda':
+                inputs = {k: v.pin_memory().to(self.device, non_blocking=True) for k, v in inputs.items()}
             
             # Get predictions.
-            with torch.no_grad():
+            with torch.inference_mode():
                 outputs = self.model(**inputs)
-                predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
+                predictions = torch.nn.functional.softmax(outputs.logits.float(), dim=-1)
                 predicted_class = torch.argmax(predictions, dim=-1).item()
                 confidence_scores = predictions.cpu().numpy()[0]
             
@@ -6,6 +6,7 @@ Supports mental health assessment through voice analysis
 """
 
 import logging
+import re
 import whisper
 import torch
 import numpy as np
@@ -22,6 +23,40 @@ from pathlib import Path
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Voice analysis markers.
+STRESS_MARKERS = frozenset({
+    'um', 'uh', 'like', 'you know', 'actually', 'basically',
+    'sort of', 'kind of', 'i mean', 'well'
+})
+
+CONFIDENCE_MARKERS = frozenset({
+    'definitely', 'certainly', 'absolutely', 'clearly',
+    'obviously', 'exactly', 'precisely'
+})
+
+def _marker_pattern(markers):
+    """Compile a whole-word alternation over markers, longest first so phrases win over their prefixes"""
+    alternation = '|'.join(map(re.escape, sorted(markers, key=len, reverse=True)))
+    return re.compile(r'\b(?:' + alternation + r')\b')
+
+# Compiled once so each transcript is scanned in a single pass per marker set,
+# and multi-word markers such as 'you know' are matched too.
+STRESS_MARKER_PATTERN = _marker_pattern(STRESS_MARKERS)
+CONFIDENCE_MARKER_PATTERN = _marker_pattern(CONFIDENCE_MARKERS)
+
+# Lower bounds of the Moderate and High voice stress levels.
+STRESS_LEVEL_NAMES = ("Low", "Moderate", "High")
+STRESS_LEVEL_THRESHOLDS = np.array([0.3, 0.6])
+
+# Speaking tips chosen from the stress score, filler-word ratio and speech clarity.
+HIGH_STRESS_RECOMMENDATIONS = (
+    "Consider practicing deep breathing exercises before speaking",
+    "Try speaking more slowly and deliberately"
+)
+FILLER_WORD_RECOMMENDATION = "Practice reducing filler words through mindful speaking"
+CLARITY_RECOMMENDATION = "Focus on clear articulation and pronunciation"
+DEFAULT_VOICE_RECOMMENDATION = "Your speech patterns indicate good emotional regulation"
+
 class SpeechToTextService:
     """
     Speech-to-text service using Whisper model
@@ -42,14 +77,8 @@ class SpeechToTextService:
         
         # Voice analysis parameters.
         self.voice_indicators = {
-            'stress_markers': [
-                'um', 'uh', 'like', 'you know', 'actually', 'basically',
-                'sort of', 'kind of', 'i mean', 'well'
-            ],
-            'confidence_markers': [
-                'definitely', 'certainly', 'absolutely', 'clearly',
-                'obviously', 'exactly', 'precisely'
-            ]
+            'stress_markers': STRESS_MARKERS,
+            'confidence_markers': CONFIDENCE_MARKERS
         }
         
         self.model = None
@@ -251,23 +280,27 @@ class SpeechToTextService:
         if not segments:
             return {}
         
-        # Calculate speaking rate.
-        total_duration = sum(seg.get("end", 0) - seg.get("start", 0) for seg in segments)
-        total_words = sum(len(seg.get("text", "").split()) for seg in segments)
-        speaking_rate = total_words / max(total_duration, 1)  # words per second
-        
-        # Calculate pause patterns.
-        pauses = []
-        for i in range(1, len(segments)):
-            pause_duration = segments[i].get("start", 0) - segments[i-1].get("end", 0)
-            if pause_duration > 0:
-                pauses.append(pause_duration)
+        # Accumulate duration, words, pauses and confidences in one pass over segments.
+        total_duration = 0
+        total_words = 0
+        pause_total = 0
+        pause_count = 0
+        confidences = []
+        prev_end = None
+        for seg in segments:
+            start = seg.get("start", 0)
+            end = seg.get("end", 0)
+            total_duration += end - start
+            total_words += len(seg.get("text", "").split())
+            confidences.append(seg.get("avg_logprob", 0))
+            if prev_end is not None and start > prev_end:
+                pause_total += start - prev_end
+                pause_count += 1
+            prev_end = end
         
-        avg_pause_duration = np.mean(pauses) if pauses else 0
-        
-        # Calculate confidence variations.
-        confidences = [seg.get("avg_logprob", 0) for seg in segments]
-        confidence_std = np.std(confidences) if confidences else 0
+        speaking_rate = total_words / max(total_duration, 1)  # words per second
+        avg_pause_duration = pause_total / pause_count if pause_count else 0
+        confidence_std = np.std(confidences)
         
         return {
             'speaking_rate_wps': round(speaking_rate, 2),
@@ -284,10 +317,10 @@ class SpeechToTextService:
         words = text_lower.split()
         
         # Count filler words (stress indicators).
-        filler_count = sum(1 for word in words if word in self.voice_indicators['stress_markers'])
+        filler_count = len(STRESS_MARKER_PATTERN.findall(text_lower))
         
         # Count confidence markers.
-        confidence_count = sum(1 for word in words if word in self.voice_indicators['confidence_markers'])
+        confidence_count = len(CONFIDENCE_MARKER_PATTERN.findall(text_lower))
         
         # Calculate ratios.
         total_words = len(words)
@@ -348,29 +381,23 @@ class SpeechToTextService:
     
     def _categorize_stress_level(self, stress_score: float) -> str:
         """Categorize stress level based on score"""
-        if stress_score < 0.3:
-            return "Low"
-        elif stress_score < 0.6:
-            return "Moderate"
-        else:
-            return "High"
+        return STRESS_LEVEL_NAMES[int(np.searchsorted(STRESS_LEVEL_THRESHOLDS, stress_score, side='right'))]
     
     def _generate_voice_recommendations(self, stress_score: float, speech_patterns: Dict) -> List[str]:
         """Generate recommendations based on voice analysis"""
         recommendations = []
         
         if stress_score > 0.6:
-            recommendations.append("Consider practicing deep breathing exercises before speaking")
-            recommendations.append("Try speaking more slowly and deliberately")
+            recommendations.extend(HIGH_STRESS_RECOMMENDATIONS)
         
         if speech_patterns.get('filler_word_ratio', 0) > 0.1:
-            recommendations.append("Practice reducing filler words through mindful speaking")
+            recommendations.append(FILLER_WORD_RECOMMENDATION)
         
         if speech_patterns.get('speech_clarity_score', 1) < 0.7:
-            recommendations.append("Focus on clear articulation and pronunciation")
+            recommendations.append(CLARITY_RECOMMENDATION)
         
         if not recommendations:
-            recommendations.append("Your speech patterns indicate good emotional regulation")
+            recommendations.append(DEFAULT_VOICE_RECOMMENDATION)
         
         return recommendations
     
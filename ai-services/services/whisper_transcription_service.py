@@ -66,7 +66,7 @@ class WhisperTranscriptionService:
                     "error": "Audio file not found"
                 }
             
-            logger.info(f"Transcribing audio file: {audio_path}")
+            logger.info("Transcribing audio file: %s", audio_path)
             
             # Transcribe with Whisper
             result = self.model.transcribe(
@@ -6,15 +6,31 @@ Integrates voice feature extraction, mental health scoring, and weighted assessm
 import os
 import tempfile
 import shutil
-from typing import Dict, Optional
+import numpy as np
+from typing import Dict, List, Optional
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.responses import JSONResponse
 
 from voice_analysis_model import VoiceFeatureExtractor
 from mental_health_scorer import MentalHealthScorer
-from weighted_assessment_engine import WeightedAssessmentEngine
+from weighted_assessment_engine import (
+    WeightedAssessmentEngine, RISK_LEVELS, RISK_MAX_THRESHOLDS, RISK_AVG_THRESHOLDS
+)
 from enhanced_voice_processor import EnhancedVoiceProcessor
 
+# Inclusive lower bounds on non-zero feature count for low, moderate and high quality.
+FEATURE_QUALITY_LEVELS = ('insufficient', 'low', 'moderate', 'high')
+FEATURE_QUALITY_THRESHOLDS = np.array([10, 15, 20])
+
+# Per-condition advice, shown only once a DASS-21 severity reaches moderate.
+ELEVATED_SEVERITIES = frozenset({'moderate', 'severe', 'extremely_severe'})
+CONDITION_RECOMMENDATIONS = {
+    'depression': "Consider professional counseling for {condition} (severity: {severity})",
+    'anxiety': "Stress management techniques recommended for {condition} (severity: {severity})",
+    'stress': "Work-life balance assessment needed for {condition} (severity: {severity})"
+}
+NORMAL_RANGE_RECOMMENDATION = "Mental health indicators within normal range"
+
 class VoiceAnalysisAPI:
     """
     Complete voice analysis API that integrates all components
@@ -42,8 +58,16 @@ class VoiceAnalysisAPI:
                 tmp_file.write(content)
                 temp_path = tmp_file.name
             
+            # Decode once at 16 kHz; quality checks and feature extraction both reuse it.
+            import librosa
+            try:
+                audio_data, sample_rate = librosa.load(temp_path, sr=16000)
+            except Exception:
+                # Leave the decode to the processor so the failure is reported as a processing error.
+                audio_data, sample_rate = None, 16000
+            
             # Process audio with enhanced voice processor.
-            processing_result = self.voice_processor.process_audio_file(temp_path, language_hint="hi")
+            processing_result = self.voice_processor.process_audio_file(temp_path, language_hint="hi", audio=audio_data)
             
             if not processing_result.get('processing_successful', False):
                 return {
@@ -53,8 +77,6 @@ class VoiceAnalysisAPI:
                 }
             
             # Extract voice features for mental health analysis.
-            import librosa
-            audio_data, sample_rate = librosa.load(temp_path, sr=16000)
             voice_features = self.feature_extractor.extract_all_features(audio_data, sample_rate)
             
             if not voice_features:
@@ -173,28 +195,19 @@ class VoiceAnalysisAPI:
         """Assess the quality of extracted features"""
         feature_count = len([v for v in features.values() if v != 0])
         
-        if feature_count >= 20:
-            return 'high'
-        elif feature_count >= 15:
-            return 'moderate'
-        elif feature_count >= 10:
-            return 'low'
-        else:
-            return 'insufficient'
+        return FEATURE_QUALITY_LEVELS[int(np.searchsorted(FEATURE_QUALITY_THRESHOLDS, feature_count, side='right'))]
     
     def _calculate_overall_risk(self, scores: Dict[str, float]) -> str:
         """Calculate overall mental health risk level"""
         max_score = max(scores.values())
         avg_score = sum(scores.values()) / len(scores)
         
-        if max_score >= 50 or avg_score >= 35:
-            return 'high'
-        elif max_score >= 25 or avg_score >= 20:
-            return 'moderate'
-        elif max_score >= 15 or avg_score >= 10:
-            return 'low'
-        else:
-            return 'minimal'
+        # The higher band reached by either the peak or the average.
+        risk_band = max(
+            np.searchsorted(RISK_MAX_THRESHOLDS, max_score, side='right'),
+            np.searchsorted(RISK_AVG_THRESHOLDS, avg_score, side='right')
+        )
+        return RISK_LEVELS[int(risk_band)]
     
     def _generate_recommendations(self, mental_health_scores: Dict) -> List[str]:
         """Generate recommendations based on assessment results"""
@@ -203,18 +216,12 @@ class VoiceAnalysisAPI:
         # Check each condition and provide specific recommendations.
         for condition, data in mental_health_scores.items():
             severity = data.get('severity', 'normal')
-            score = data.get('score', 0)
             
-            if severity in ['moderate', 'severe', 'extremely_severe']:
-                if condition == 'depression':
-                    recommendations.append(f"Consider professional counseling for {condition} (severity: {severity})")
-                elif condition == 'anxiety':
-                    recommendations.append(f"Stress management techniques recommended for {condition} (severity: {severity})")
-                elif condition == 'stress':
-                    recommendations.append(f"Work-life balance assessment needed for {condition} (severity: {severity})")
+            if severity in ELEVATED_SEVERITIES and condition in CONDITION_RECOMMENDATIONS:
+                recommendations.append(CONDITION_RECOMMENDATIONS[condition].format(condition=condition, severity=severity))
         
         if not recommendations:
-            recommendations.append("Mental health indicators within normal range")
+            recommendations.append(NORMAL_RANGE_RECOMMENDATION)
         
         return recommendations
 
@@ -14,6 +14,10 @@ try:
 except ImportError:
     TRANSFORMERS_AVAILABLE = False
 
+from services.model_loading import from_pretrained
+
+WAV2VEC_MODEL_NAME = "facebook/wav2vec2-large-xlsr-53"
+
 class VoiceFeatureExtractor:
     """
     Voice feature extraction for mental health assessment
@@ -49,8 +53,8 @@ class VoiceFeatureExtractor:
             return
             
         try:
-            self.wav2vec_processor = Wav2Vec2Processor.from_pretrained("facebook/wav2vec2-large-xlsr-53")
-            self.wav2vec_model = Wav2Vec2Model.from_pretrained("facebook/wav2vec2-large-xlsr-53")
+            self.wav2vec_processor = from_pretrained(Wav2Vec2Processor, WAV2VEC_MODEL_NAME)
+            self.wav2vec_model = from_pretrained(Wav2Vec2Model, WAV2VEC_MODEL_NAME)
             self.wav2vec_model.to(self.device)
         except Exception as e:
             self.wav2vec_processor = None
@@ -163,7 +167,7 @@ class VoiceFeatureExtractor:
             })
         
         # Speaking rate estimation.
-        speaking_frames = np.sum(voiced_frames)
+        speaking_frames = np.count_nonzero(voiced_frames)
         speaking_time = speaking_frames * self.hop_length / sr
         features['speaking_rate'] = speaking_time / (len(audio) / sr) if len(audio) > 0 else 0
         
@@ -184,16 +188,17 @@ class VoiceFeatureExtractor:
             # Process with Wav2Vec2.
             inputs = self.wav2vec_processor(audio, sampling_rate=16000, return_tensors="pt", padding=True)
             
-            with torch.no_grad():
+            with torch.inference_mode():
                 inputs = {k: v.to(self.device) for k, v in inputs.items()}
                 outputs = self.wav2vec_model(**inputs)
                 hidden_states = outputs.last_hidden_state.cpu().numpy().flatten()
                 
+                mean, std, skewness, kurtosis = self._calculate_moments(hidden_states)
                 features.update({
-                    'wav2vec_mean': np.mean(hidden_states),
-                    'wav2vec_std': np.std(hidden_states),
-                    'wav2vec_skewness': self._calculate_skewness(hidden_states),
-                    'wav2vec_kurtosis': self._calculate_kurtosis(hidden_states)
+                    'wav2vec_mean': mean,
+                    'wav2vec_std': std,
+                    'wav2vec_skewness': skewness,
+                    'wav2vec_kurtosis': kurtosis
                 })
                 
         except Exception as e:
@@ -209,36 +214,22 @@ class VoiceFeatureExtractor:
     
     def _get_segments(self, binary_array: np.ndarray) -> List[Tuple[int, int]]:
         """Extract continuous segments from binary array"""
-        segments = []
-        start = None
-        
-        for i, val in enumerate(binary_array):
-            if val and start is None:
-                start = i
-            elif not val and start is not None:
-                segments.append((start, i))
-                start = None
-        
-        if start is not None:
-            segments.append((start, len(binary_array)))
-        
-        return segments
-    
-    def _calculate_skewness(self, data: np.ndarray) -> float:
-        """Calculate skewness of data distribution"""
-        mean = np.mean(data)
-        std = np.std(data)
-        if std == 0:
-            return 0
-        return np.mean(((data - mean) / std) ** 3)
+        # Pad with False so every run has a rising and a falling edge.
+        padded = np.concatenate(([False], np.asarray(binary_array, dtype=bool), [False]))
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        return list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
     
-    def _calculate_kurtosis(self, data: np.ndarray) -> float:
-        """Calculate kurtosis of data distribution"""
+    def _calculate_moments(self, data: np.ndarray) -> Tuple[float, float, float, float]:
+        """Calculate mean, std, skewness and excess kurtosis sharing one standardization pass"""
         mean = np.mean(data)
         std = np.std(data)
         if std == 0:
-            return 0
-        return np.mean(((data - mean) / std) ** 4) - 3
+            return mean, std, 0, 0
+        z = (data - mean) / std
+        z2 = z * z
+        skewness = np.mean(z2 * z)
+        kurtosis = np.mean(z2 * z2) - 3
+        return mean, std, skewness, kurtosis
     
     def extract_all_features(self, audio: np.ndarray, sr: int) -> Dict[str, float]:
         """Extract complete feature set from audio signal"""
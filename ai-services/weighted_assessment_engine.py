@@ -6,6 +6,19 @@ Combines multiple AI assessment components with configurable weights
 import numpy as np
 from typing import Dict, Optional
 
+CONDITIONS = ('depression', 'anxiety', 'stress')
+COMPONENTS = ('voice', 'sentiment', 'keyword', 'facial')
+
+# Inclusive lower bounds for each label band, ordered from lowest to highest.
+RISK_LEVELS = ('minimal', 'low', 'moderate', 'high')
+RISK_MAX_THRESHOLDS = np.array([15, 25, 50])
+RISK_AVG_THRESHOLDS = np.array([10, 20, 35])
+
+SEVERITY_LEVELS = ('normal', 'mild', 'moderate', 'severe', 'extremely_severe')
+
+QUALITY_LEVELS = ('insufficient', 'low', 'moderate', 'high')
+QUALITY_THRESHOLDS = np.array([0.25, 0.5, 0.75])
+
 class WeightedAssessmentEngine:
     """
     Weighted assessment engine that combines multiple AI analysis components
@@ -138,56 +151,31 @@ class WeightedAssessmentEngine:
     
     def _calculate_weighted_scores(self, component_scores: Dict) -> Dict:
         """Calculate final weighted scores from all components"""
-        final_scores = {'depression': 0, 'anxiety': 0, 'stress': 0}
-        total_weight = 0
-        
-        # Weight mapping for components.
-        weight_mapping = {
-            'voice': self.component_weights['voice_analysis'],
-            'sentiment': self.component_weights['sentiment_analysis'],
-            'keyword': self.component_weights['keyword_analysis'],
-            'facial': self.component_weights['facial_analysis']
-        }
-        
-        # Calculate weighted sum for each condition.
-        for condition in ['depression', 'anxiety', 'stress']:
-            weighted_sum = 0
-            condition_weight = 0
-            
-            for component, score in component_scores[condition].items():
-                if component in weight_mapping:
-                    weight = weight_mapping[component]
-                    weighted_sum += score * weight
-                    condition_weight += weight
-            
-            if condition_weight > 0:
-                final_scores[condition] = weighted_sum / condition_weight
-            
-            total_weight = max(total_weight, condition_weight)
+        # (condition x component) score matrix, with a mask of the components that reported.
+        scores = np.array([[component_scores[c].get(k, 0) for k in COMPONENTS] for c in CONDITIONS], dtype=float)
+        present = np.array([[k in component_scores[c] for k in COMPONENTS] for c in CONDITIONS])
+        
+        # Weighted mean per condition over the available components only.
+        # Read from component_weights on every call so changes to the dict take effect.
+        weight_vector = np.array([self.component_weights[f'{k}_analysis'] for k in COMPONENTS])
+        weights = present * weight_vector
+        condition_weight = weights.sum(axis=1)
+        weighted_mean = np.divide((scores * weights).sum(axis=1), condition_weight,
+                                  out=np.zeros(len(CONDITIONS)), where=condition_weight > 0)
+        final_scores = dict(zip(CONDITIONS, weighted_mean.tolist()))
         
         # Add severity classifications.
-        categories = ['depression', 'anxiety', 'stress']
-        for category in categories:
-            score = final_scores[category]
-            severity = self._score_to_severity(score, category)
-            final_scores[f'{category}_severity'] = severity
+        for condition in CONDITIONS:
+            final_scores[f'{condition}_severity'] = self._score_to_severity(final_scores[condition], condition)
         
         return final_scores
     
     def _score_to_severity(self, score: float, condition: str) -> str:
         """Convert numerical score to DASS-21 compatible severity level"""
-        thresholds = self.severity_thresholds[condition]
-        
-        if score <= thresholds['normal']:
-            return 'normal'
-        elif score <= thresholds['mild']:
-            return 'mild'
-        elif score <= thresholds['moderate']:
-            return 'moderate'
-        elif score <= thresholds['severe']:
-            return 'severe'
-        else:
-            return 'extremely_severe'
+        # First band whose inclusive upper bound covers the score; past the last is extremely severe.
+        bounds = np.fromiter(self.severity_thresholds[condition].values(), dtype=float)
+        band = np.searchsorted(bounds, score, side='left')
+        return SEVERITY_LEVELS[int(band)]
     
     def _assess_overall_risk(self, final_scores: Dict) -> Dict:
         """Assess overall mental health risk based on final scores"""
@@ -198,15 +186,12 @@ class WeightedAssessmentEngine:
         max_score = max(depression_score, anxiety_score, stress_score)
         avg_score = (depression_score + anxiety_score + stress_score) / 3
         
-        # Determine risk level.
-        if max_score >= 50 or avg_score >= 35:
-            risk_level = 'high'
-        elif max_score >= 25 or avg_score >= 20:
-            risk_level = 'moderate'
-        elif max_score >= 15 or avg_score >= 10:
-            risk_level = 'low'
-        else:
-            risk_level = 'minimal'
+        # Determine risk level: the higher band reached by either the peak or the average.
+        risk_band = max(
+            np.searchsorted(RISK_MAX_THRESHOLDS, max_score, side='right'),
+            np.searchsorted(RISK_AVG_THRESHOLDS, avg_score, side='right')
+        )
+        risk_level = RISK_LEVELS[int(risk_band)]
         
         return {
             'overall_risk': risk_level,
@@ -239,14 +224,7 @@ class WeightedAssessmentEngine:
         completeness = available_components / total_components
         
         # Determine quality level.
-        if completeness >= 0.75:
-            quality = 'high'
-        elif completeness >= 0.5:
-            quality = 'moderate'
-        elif completeness >= 0.25:
-            quality = 'low'
-        else:
-            quality = 'insufficient'
+        quality = QUALITY_LEVELS[int(np.searchsorted(QUALITY_THRESHOLDS, completeness, side='right'))]
         
         return {
             'completeness': completeness,